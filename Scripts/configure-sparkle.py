@@ -5,19 +5,71 @@ Adds Sparkle Swift Package and configures dependencies
 """
 
 import re
+import shutil
 import sys
 from pathlib import Path
 
+_SPARKLE_RE = re.compile(r'sparkle-project', re.IGNORECASE)
+_ANCHORS_RE = re.compile(
+    r'^/\* (?P<marker>Begin|End) (?P<section>\w+) section \*/$'
+    r'|(?P<quill_target>8444F69F2DEB50FA002F0BEA /\* Quill \*/ = \{)'
+    r'|(?P<project_dir_path>projectDirPath = "";)',
+    re.MULTILINE
+)
+_GENERATE_INFOPLIST_RE = re.compile(
+    r'(8444F6C[45]2DEB50FD002F0BEA /\* (?:Debug|Release) \*/ = \{[^}]*?GENERATE_INFOPLIST_FILE = )YES;'
+)
+
 def generate_uuid():
     """Generate a UUID in Xcode format (24 hex chars)"""
     import secrets
     return secrets.token_hex(12).upper()
 
-def add_sparkle_to_project(project_path):
-    """Add Sparkle package to project.pbxproj"""
+def index_anchors(content):
+    """Collect section (start, end) spans and anchor offsets in a single scan"""
+    sections = {}
+    anchors = {}
+    begins = {}
+    for match in _ANCHORS_RE.finditer(content):
+        if match.group('marker') == 'Begin':
+            begins[match.group('section')] = match.start()
+        elif match.group('marker') == 'End':
+            name = match.group('section')
+            if name in begins:
+                sections[name] = (begins.pop(name), match.end())
+        else:
+            anchors.setdefault(match.lastgroup, match.start())
+    return sections, anchors
+
+def anchor_in_section(sections, anchors, anchor, section):
+    """Return the anchor offset if it lies inside the named section, else None"""
+    pos = anchors.get(anchor)
+    if pos is None or section not in sections:
+        return None
+    start, end = sections[section]
+    return pos if start <= pos < end else None
+
+def apply_edits(content, edits):
+    """Apply (start, end, replacement) edits in one pass over content"""
+    chunks = []
+    cursor = 0
+    for start, end, replacement in sorted(edits):
+        chunks.append(content[cursor:start])
+        chunks.append(replacement)
+        cursor = end
+    chunks.append(content[cursor:])
+    return ''.join(chunks)
+
+def add_sparkle_to_project(project_path, content=None):
+    """Add Sparkle package to project.pbxproj, reusing already-read content if given"""
+
+    if content is None:
+        content = Path(project_path).read_bytes().decode('utf-8')
 
-    with open(project_path, 'r') as f:
-        content = f.read()
+    # Check if Sparkle is already added
+    if _SPARKLE_RE.search(content):
+        print("Sparkle already configured in project")
+        return False
 
     # Generate UUIDs for new objects
     package_ref_uuid = generate_uuid()
@@ -26,22 +78,22 @@ def add_sparkle_to_project(project_path):
     print(f"Package Reference UUID: {package_ref_uuid}")
     print(f"Package Product UUID: {package_product_uuid}")
 
-    # Check if Sparkle is already added
-    if 'sparkle-project' in content.lower():
-        print("Sparkle already configured in project")
-        return False
+    sections, anchors = index_anchors(content)
 
-    # Find the target UUID for Quill
-    target_match = re.search(r'(/\* Quill \*/ = \{[^}]+isa = PBXNativeTarget[^}]+)productReference = ([A-F0-9]+)', content, re.DOTALL)
-    if not target_match:
+    # Find the Quill target inside the PBXNativeTarget section
+    target_start = anchor_in_section(sections, anchors, 'quill_target', 'PBXNativeTarget')
+    target_end = -1 if target_start is None else content.find('\n\t\t};', target_start)
+    if target_end == -1:
         print("ERROR: Could not find Quill target")
         return False
 
-    # Find the project UUID
-    project_match = re.search(r'(/\* Project object \*/);\s*objects = \{', content)
-    if not project_match:
-        print("ERROR: Could not find project object")
+    # Find the project object
+    if 'PBXProject' not in sections:
+        print("ERROR: Could not find PBXProject section")
         return False
+    pbx_project_start, pbx_project_end = sections['PBXProject']
+
+    edits = []
 
     # 1. Add XCRemoteSwiftPackageReference section
     package_ref_section = f'''
@@ -69,31 +121,35 @@ def add_sparkle_to_project(project_path):
 '''
 
     # Insert sections before PBXProject section
-    pbx_project_pos = content.find('/* Begin PBXProject section */')
-    if pbx_project_pos == -1:
-        print("ERROR: Could not find PBXProject section")
-        return False
-
-    content = content[:pbx_project_pos] + package_ref_section + '\n' + product_dep_section + '\n' + content[pbx_project_pos:]
+    edits.append((pbx_project_start, pbx_project_start, package_ref_section + '\n' + product_dep_section + '\n'))
 
     # 3. Add package reference to project
-    # Find: productRefGroup = ... ; projectDirPath = "";
-    project_section = re.search(r'(projectDirPath = "";[^}]+projectRoot = "";[^}]+targets = \([^)]+\);)', content, re.DOTALL)
-    if project_section:
+    # Find: projectDirPath = ""; ... projectRoot = ""; ... targets = (...);
+    targets_end = -1
+    dir_path_pos = anchor_in_section(sections, anchors, 'project_dir_path', 'PBXProject')
+    if dir_path_pos is not None:
+        root_pos = content.find('projectRoot = "";', dir_path_pos, pbx_project_end)
+        if root_pos != -1:
+            targets_pos = content.find('targets = (', root_pos, pbx_project_end)
+            if targets_pos != -1:
+                targets_end = content.find(');', targets_pos, pbx_project_end)
+    if targets_end != -1:
         # Add package references array after targets
-        new_project_content = project_section.group(1) + f'\n\t\t\tpackageReferences = (\n\t\t\t\t{package_ref_uuid} /* XCRemoteSwiftPackageReference "Sparkle" */,\n\t\t\t);'
-        content = content.replace(project_section.group(1), new_project_content)
+        insert_pos = targets_end + len(');')
+        edits.append((insert_pos, insert_pos,
+                      f'\n\t\t\tpackageReferences = (\n\t\t\t\t{package_ref_uuid} /* XCRemoteSwiftPackageReference "Sparkle" */,\n\t\t\t);'))
 
     # 4. Add product dependency to Quill target
     # Find the Quill target's packageProductDependencies
-    target_section = re.search(r'(8444F69F2DEB50FA002F0BEA /\* Quill \*/ = \{[^}]+packageProductDependencies = \()\s*(\);)', content, re.DOTALL)
-    if target_section:
-        new_target_content = target_section.group(1) + f'\n\t\t\t\t{package_product_uuid} /* Sparkle */,\n\t\t\t' + target_section.group(2)
-        content = content.replace(target_section.group(0), new_target_content)
+    dependencies_pos = content.find('packageProductDependencies = (', target_start, target_end)
+    if dependencies_pos != -1:
+        insert_pos = dependencies_pos + len('packageProductDependencies = (')
+        edits.append((insert_pos, insert_pos, f'\n\t\t\t\t{package_product_uuid} /* Sparkle */,'))
+
+    content = apply_edits(content, edits)
 
     # Write back
-    with open(project_path, 'w') as f:
-        f.write(content)
+    Path(project_path).write_bytes(content.encode('utf-8'))
 
     print("✓ Added Sparkle package to project")
     return True
@@ -121,8 +177,7 @@ def create_info_plist(info_plist_path):
 </plist>
 '''
 
-    with open(info_plist_path, 'w') as f:
-        f.write(info_plist_content)
+    info_plist_path.write_bytes(info_plist_content.encode('utf-8'))
 
     print(f"✓ Created Info.plist at {info_plist_path}")
     return True
@@ -130,25 +185,23 @@ def create_info_plist(info_plist_path):
 def update_project_for_info_plist(project_path):
     """Update project to use Info.plist file"""
 
-    with open(project_path, 'r') as f:
-        content = f.read()
+    content = Path(project_path).read_bytes().decode('utf-8')
 
-    # Change GENERATE_INFOPLIST_FILE to NO for Quill target
-    content = re.sub(
-        r'(8444F6C[45]2DEB50FD002F0BEA /\* Debug|Release \*/ = \{[^}]+GENERATE_INFOPLIST_FILE = )YES;',
-        r'\1NO;',
-        content
-    )
+    sections, _ = index_anchors(content)
+    if 'XCBuildConfiguration' not in sections:
+        print("ERROR: Could not find XCBuildConfiguration section")
+        return False
 
-    # Add INFOPLIST_FILE setting
-    content = re.sub(
-        r'(8444F6C[45]2DEB50FD002F0BEA /\* Debug|Release \*/ = \{[^}]+GENERATE_INFOPLIST_FILE = NO;)',
-        r'\1\n\t\t\t\tINFOPLIST_FILE = Quill/Info.plist;',
-        content
+    # Change GENERATE_INFOPLIST_FILE to NO and add INFOPLIST_FILE for the Quill target
+    # in a single pass over the build configurations
+    section_start, section_end = sections['XCBuildConfiguration']
+    updated_section = _GENERATE_INFOPLIST_RE.sub(
+        lambda match: match.group(1) + 'NO;\n\t\t\t\tINFOPLIST_FILE = Quill/Info.plist;',
+        content[section_start:section_end]
     )
+    content = apply_edits(content, [(section_start, section_end, updated_section)])
 
-    with open(project_path, 'w') as f:
-        f.write(content)
+    Path(project_path).write_bytes(content.encode('utf-8'))
 
     print("✓ Updated project to use Info.plist")
     return True
@@ -161,15 +214,20 @@ def main():
         print(f"ERROR: Project file not found: {project_file}")
         sys.exit(1)
 
+    # Nothing to do on re-runs, so skip the backup as well
+    content = project_file.read_bytes().decode('utf-8')
+    if _SPARKLE_RE.search(content) and info_plist.exists():
+        print("Sparkle already configured in project")
+        return
+
     # Backup
     backup_file = project_file.with_suffix('.pbxproj.backup')
-    import shutil
-    shutil.copy(project_file, backup_file)
+    shutil.copyfile(project_file, backup_file)
     print(f"✓ Created backup: {backup_file}")
 
     # Add Sparkle package
     print("\n1. Adding Sparkle package...")
-    add_sparkle_to_project(project_file)
+    add_sparkle_to_project(project_file, content)
 
     # Create Info.plist
     print("\n2. Creating Info.plist...")
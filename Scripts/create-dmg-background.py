@@ -4,71 +4,84 @@ create-dmg-background.py
 Creates a custom background image for the Quill DMG installer
 """
 
+import os
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import sys
 
+ARROW_LENGTH = 80
+ARROW_HEAD_LENGTH = 15
+ARROW_HEAD_HALF_HEIGHT = 10
+ARROW_COLOR = (100, 100, 100)
+
+SYSTEM_FONT_PATH = "/System/Library/Fonts/SFNS.ttf"
+FONT_PATH = SYSTEM_FONT_PATH if os.path.exists(SYSTEM_FONT_PATH) else None
+
+def load_font(size):
+    """Load the system font at the given size, falling back to the default font"""
+    if FONT_PATH:
+        return ImageFont.truetype(FONT_PATH, size)
+    return ImageFont.load_default()
+
+FONT_LARGE = load_font(28)
+FONT_MEDIUM = load_font(18)
+
+def render_arrow():
+    """Rasterize the right-pointing arrow once into a transparent sprite"""
+    sprite = Image.new('RGBA', (ARROW_LENGTH + 1, 2 * ARROW_HEAD_HALF_HEIGHT + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    mid_y = ARROW_HEAD_HALF_HEIGHT
+
+    # Arrow line
+    draw.line([(0, mid_y), (ARROW_LENGTH, mid_y)], fill=ARROW_COLOR, width=3)
+    # Arrow head
+    draw.polygon([
+        (ARROW_LENGTH, mid_y),
+        (ARROW_LENGTH - ARROW_HEAD_LENGTH, mid_y - ARROW_HEAD_HALF_HEIGHT),
+        (ARROW_LENGTH - ARROW_HEAD_LENGTH, mid_y + ARROW_HEAD_HALF_HEIGHT)
+    ], fill=ARROW_COLOR)
+    return sprite
+
+ARROW_SPRITE = render_arrow()
+
 def create_dmg_background(output_path, width=660, height=400):
     """Create a beautiful gradient background with installation instructions"""
 
-    # Create image with gradient background
-    img = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(img)
-
     # Create subtle gradient (light blue to white)
-    for y in range(height):
-        # Gradient from #E8F4F8 to #FFFFFF
-        r = int(232 + (255 - 232) * (y / height))
-        g = int(244 + (255 - 244) * (y / height))
-        b = int(248 + (255 - 248) * (y / height))
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-
-    # Add instruction text
-    try:
-        # Try to use system font
-        font_large = ImageFont.truetype("/System/Library/Fonts/SFNS.ttf", 28)
-        font_medium = ImageFont.truetype("/System/Library/Fonts/SFNS.ttf", 18)
-    except:
-        # Fallback to default font
-        font_large = ImageFont.load_default()
-        font_medium = ImageFont.load_default()
+    # Gradient from #E8F4F8 to #FFFFFF, one row per scanline
+    start = np.array([232, 244, 248], dtype=np.float64)
+    end = np.array([255, 255, 255], dtype=np.float64)
+    t = (np.arange(height, dtype=np.float64) / height)[:, None]
+    rows = (start + (end - start) * t).astype(np.uint8)
+    gradient = np.broadcast_to(rows[:, None, :], (height, width, 3))
+
+    img = Image.fromarray(np.ascontiguousarray(gradient), 'RGB')
+    draw = ImageDraw.Draw(img)
 
     # Draw title
     title = "Install Quill"
-    title_bbox = draw.textbbox((0, 0), title, font=font_large)
-    title_width = title_bbox[2] - title_bbox[0]
+    title_width = FONT_LARGE.getlength(title)
     draw.text(
         ((width - title_width) / 2, 30),
         title,
         fill=(50, 50, 50),
-        font=font_large
+        font=FONT_LARGE
     )
 
     # Draw instruction
     instruction = "Drag Quill to the Applications folder"
-    inst_bbox = draw.textbbox((0, 0), instruction, font=font_medium)
-    inst_width = inst_bbox[2] - inst_bbox[0]
+    inst_width = FONT_MEDIUM.getlength(instruction)
     draw.text(
         ((width - inst_width) / 2, 340),
         instruction,
         fill=(100, 100, 100),
-        font=font_medium
+        font=FONT_MEDIUM
     )
 
     # Draw arrow indicator (simple arrow pointing right)
     arrow_y = 200
     arrow_start_x = 280
-    arrow_end_x = 360
-    arrow_color = (100, 100, 100)
-
-    # Arrow line
-    draw.line([(arrow_start_x, arrow_y), (arrow_end_x, arrow_y)],
-              fill=arrow_color, width=3)
-    # Arrow head
-    draw.polygon([
-        (arrow_end_x, arrow_y),
-        (arrow_end_x - 15, arrow_y - 10),
-        (arrow_end_x - 15, arrow_y + 10)
-    ], fill=arrow_color)
+    img.paste(ARROW_SPRITE, (arrow_start_x, arrow_y - ARROW_HEAD_HALF_HEIGHT), ARROW_SPRITE)
 
     # Save the image
     img.save(output_path, 'PNG')
@@ -11,50 +11,25 @@ Example:
     ./Scripts/update-appcast.py 1.0.5 3517446 release_notes.md "MEUCIQDxA..."
 """
 
+import html
+import mmap
 import sys
 import os
 import re
 from datetime import datetime
-from xml.etree import ElementTree as ET
 
-def parse_release_notes(release_notes_file):
-    """Extract release notes from markdown file."""
-    if not os.path.exists(release_notes_file):
-        return ["See the full release notes for details."]
+MAX_RELEASE_NOTES = 5
+DEFAULT_RELEASE_NOTES = ("See the full release notes for details.",)
 
-    with open(release_notes_file, 'r') as f:
-        content = f.read()
+_RFC822_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_RFC822_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
 
-    # Extract lines between "What's Changed" and "Installation"
-    notes = []
-    in_section = False
-    for line in content.split('\n'):
-        if "## What's Changed" in line or "## What's New" in line:
-            in_section = True
-            continue
-        if line.startswith('## ') and in_section:
-            break
-        if in_section and line.strip().startswith('- '):
-            # Remove commit hash if present: "- Fix something (abc123)" -> "Fix something"
-            clean_line = re.sub(r'\s*\([a-f0-9]{7}\)\s*$', '', line.strip('- ').strip())
-            if clean_line:
-                notes.append(clean_line)
-
-    return notes[:5] if notes else ["See the full release notes for details."]
+_BULLET_RE = re.compile(r'\s*- (.*)')
+_COMMIT_RE = re.compile(r'\s*\([a-f0-9]{7}\)\s*$')
+_INSERTION_RE = re.compile(rb'-->\s*\n\s*\n')
 
-def create_item_xml(version, dmg_size, release_notes, repo="zmh/quill", ed_signature=None):
-    """Create a new <item> XML string for the appcast."""
-    # Publication date (RFC 822 format)
-    pub_date = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S +0000')
-
-    # Format release notes as HTML list items
-    notes_html = '\n'.join([f'                    <li>{note}</li>' for note in release_notes])
-
-    # Add EdDSA signature if provided
-    signature_attr = f'\n                sparkle:edSignature="{ed_signature}"' if ed_signature else ''
-
-    # Build the XML string manually to match the existing format exactly
-    item_xml = f"""        <item>
+# Appcast <item> layout, kept in sync with the existing entries in appcast.xml
+_ITEM_TEMPLATE = """        <item>
             <title>Version {version}</title>
             <pubDate>{pub_date}</pubDate>
             <sparkle:version>{version}</sparkle:version>
@@ -74,44 +49,99 @@ def create_item_xml(version, dmg_size, release_notes, repo="zmh/quill", ed_signa
             <sparkle:minimumSystemVersion>14.0</sparkle:minimumSystemVersion>
         </item>"""
 
+def parse_release_notes(release_notes_file):
+    """Extract release notes from markdown file."""
+    if not os.path.exists(release_notes_file):
+        return list(DEFAULT_RELEASE_NOTES)
+
+    # Extract lines between "What's Changed" and "Installation"
+    notes = []
+    in_section = False
+    with open(release_notes_file, 'r') as f:
+        for line in f:
+            if not in_section:
+                if "## What's Changed" in line or "## What's New" in line:
+                    in_section = True
+                continue
+            if line.startswith('## '):
+                break
+            bullet = _BULLET_RE.match(line)
+            if bullet:
+                # Remove commit hash if present: "- Fix something (abc123)" -> "Fix something"
+                clean_line = bullet.group(1).strip('- ').strip()
+                if clean_line.endswith(')'):
+                    clean_line = _COMMIT_RE.sub('', clean_line)
+                if clean_line:
+                    notes.append(clean_line)
+                    if len(notes) >= MAX_RELEASE_NOTES:
+                        break
+
+    return notes if notes else list(DEFAULT_RELEASE_NOTES)
+
+def format_rfc822(moment):
+    """Format a UTC datetime as an RFC 822 date with English day and month names."""
+    return (f'{_RFC822_DAYS[moment.weekday()]}, {moment.day:02d} {_RFC822_MONTHS[moment.month - 1]} '
+            f'{moment.year} {moment.hour:02d}:{moment.minute:02d}:{moment.second:02d} +0000')
+
+def create_item_xml(version, dmg_size, release_notes, repo="zmh/quill", ed_signature=None):
+    """Create a new <item> XML string for the appcast."""
+    # Publication date (RFC 822 format)
+    pub_date = format_rfc822(datetime.utcnow())
+
+    # Format release notes as HTML list items
+    notes_html = '\n'.join([f'                    <li>{html.escape(note)}</li>' for note in release_notes])
+
+    # Add EdDSA signature if provided
+    signature_attr = f'\n                sparkle:edSignature="{html.escape(ed_signature)}"' if ed_signature else ''
+
+    # Escape user-controlled fields before templating them into the XML
+    item_xml = _ITEM_TEMPLATE.format(
+        version=html.escape(version),
+        pub_date=pub_date,
+        notes_html=notes_html,
+        repo=html.escape(repo),
+        dmg_size=html.escape(str(dmg_size)),
+        signature_attr=signature_attr
+    )
+
     return item_xml
 
 def update_appcast(appcast_file, version, dmg_size, release_notes_file, repo="zmh/quill", ed_signature=None):
     """Update the appcast.xml file with a new release."""
-    # Read the file content
-    with open(appcast_file, 'r') as f:
-        content = f.read()
-
     # Parse release notes
     release_notes = parse_release_notes(release_notes_file)
 
     # Create new item XML (as a formatted string)
     new_item_xml = create_item_xml(version, dmg_size, release_notes, repo, ed_signature)
 
-    # Find the insertion point (after the comment block, before first existing item)
-    # Look for the end of the comment block (-->)
-    insertion_pattern = r'(-->\s*\n\s*\n)'
-
-    if re.search(insertion_pattern, content):
-        # Insert the new item after the comment block
-        updated_content = re.sub(
-            insertion_pattern,
-            r'\1' + new_item_xml + '\n\n',
-            content,
-            count=1
-        )
-
-        # Write back
-        with open(appcast_file, 'w') as f:
-            f.write(updated_content)
-
-        print(f"✓ Updated {appcast_file} with version {version}")
-        print(f"  - DMG size: {dmg_size} bytes")
-        print(f"  - Release notes: {len(release_notes)} items")
-        return True
-    else:
-        print(f"✗ Could not find insertion point in {appcast_file}")
-        return False
+    # Splice the new item into a temporary copy, then swap it in atomically
+    tmp_file = f"{appcast_file}.tmp"
+    with open(appcast_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            print(f"✗ Could not find insertion point in {appcast_file}")
+            return False
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Find the insertion point (after the comment block, before first existing item)
+            # Look for the end of the comment block (-->)
+            match = _INSERTION_RE.search(mm)
+            if not match:
+                print(f"✗ Could not find insertion point in {appcast_file}")
+                return False
+
+            # Insert the new item after the comment block
+            insert_pos = match.end()
+            with open(tmp_file, 'wb') as out:
+                out.write(mm[:insert_pos])
+                out.write(new_item_xml.encode('utf-8') + b'\n\n')
+                out.write(mm[insert_pos:])
+
+    os.replace(tmp_file, appcast_file)
+
+    print(f"✓ Updated {appcast_file} with version {version}")
+    print(f"  - DMG size: {dmg_size} bytes")
+    print(f"  - Release notes: {len(release_notes)} items")
+    return True
 
 def main():
     if len(sys.argv) < 4: